@@ -1,61 +1,76 @@
+import time
+_MODULE_START = time.perf_counter()
+
+import ast
+import os
 import re
+import sys
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Set, Optional
+from typing import Any, Callable, Dict, List, Tuple, Set, Optional
 import threading
-import time
 import functools
+from array import array
 from queue import Queue
 
-# Token counting function: Uses tiktoken if available; otherwise falls back to a regex-based method.
-try:
-    import tiktoken
+# Token counting: tiktoken is imported lazily on first use (or by the background
+# warm-up started in main) so it does not slow down startup. If tiktoken is not
+# available, a regex-based method is used instead.
+_encoding: Any = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+# Cache for token counts to avoid recounting the same text
+token_cache: Dict[int, int] = {}
+MAX_CACHE_SIZE = 100
+
+
+def get_encoding() -> Any:
+    """
+    Return the "cl100k_base" tiktoken encoding, importing and loading it on first call.
+    Returns None if tiktoken is not available. Concurrent callers wait for a single load.
+    """
+    global _encoding, _encoding_loaded
+    if _encoding_loaded:
+        return _encoding
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("cl100k_base")
+            except Exception as e:
+                print(f"tiktoken unavailable, using regex token counting: {e}")
+                _encoding = None
+            _encoding_loaded = True
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    Returns the token count of the given text using the "cl100k_base" encoding,
+    which is appropriate for LLM contexts, or a regex-based approximation when
+    tiktoken is not available. Uses caching for performance.
+    """
+    # Use hash of text as key to avoid storing large strings in memory
+    text_hash = hash(text)
+    if text_hash in token_cache:
+        return token_cache[text_hash]
     
-    # Cache for token counts to avoid recounting the same text
-    token_cache = {}
+    encoding = get_encoding()
+    if encoding is not None:
+        count = len(encoding.encode(text))
+    else:
+        count = len(re.findall(r"\w+|[^\w\s]", text, re.UNICODE))
     
-    def count_tokens(text: str) -> int:
-        """
-        Returns the token count of the given text using the "cl100k_base" encoding,
-        which is appropriate for LLM contexts. Uses caching for performance.
-        """
-        # Use hash of text as key to avoid storing large strings in memory
-        text_hash = hash(text)
-        if text_hash in token_cache:
-            return token_cache[text_hash]
-            
-        encoding = tiktoken.get_encoding("cl100k_base")
-        tokens = encoding.encode(text)
-        count = len(tokens)
-        token_cache[text_hash] = count
-        return count
-except ImportError:
-    # Simple LRU cache for token counts
-    token_cache = {}
-    MAX_CACHE_SIZE = 100
-    
-    def count_tokens(text: str) -> int:
-        """
-        Fallback method for token counting using regex when tiktoken is not available.
-        Uses caching for performance.
-        """
-        # Use hash of text as key to avoid storing large strings in memory
-        text_hash = hash(text)
-        if text_hash in token_cache:
-            return token_cache[text_hash]
-            
-        tokens = re.findall(r"\w+|[^\w\s]", text, re.UNICODE)
-        count = len(tokens)
-        
-        # Manage cache size
-        if len(token_cache) >= MAX_CACHE_SIZE:
-            # Remove a random item (simple approach)
-            token_cache.pop(next(iter(token_cache)))
-        
-        token_cache[text_hash] = count
-        return count
+    # Manage cache size
+    if len(token_cache) >= MAX_CACHE_SIZE:
+        # Remove a random item (simple approach)
+        token_cache.pop(next(iter(token_cache)))
+    
+    token_cache[text_hash] = count
+    return count
 
 
 def threaded(fn):
@@ -69,26 +84,673 @@ def threaded(fn):
     return wrapper
 
 
+class StartupTimer:
+    """
+    Collects the duration of each startup phase and prints a breakdown once the
+    main-thread phases and all background phases have finished.
+    """
+    def __init__(self, start: float) -> None:
+        self.start: float = start
+        self.last: float = start
+        self.phases: List[Tuple[str, float]] = []
+        self.pending: int = 0
+        self.main_done: bool = False
+        self.reported: bool = False
+        self.ready: float = 0.0
+        self._lock = threading.Lock()
+
+    def mark(self, phase: str) -> None:
+        """Record a main-thread phase lasting from the previous mark until now."""
+        now = time.perf_counter()
+        with self._lock:
+            self.phases.append((phase, now - self.last))
+            self.last = now
+
+    def begin_background(self) -> float:
+        """Register a background phase and return its start time."""
+        with self._lock:
+            self.pending += 1
+        return time.perf_counter()
+
+    def end_background(self, phase: str, started: float) -> None:
+        """Record a finished background phase."""
+        with self._lock:
+            self.phases.append((f"{phase} (background)", time.perf_counter() - started))
+            self.pending -= 1
+        self._maybe_report()
+
+    def done(self) -> None:
+        """Mark the end of the main-thread startup (window shown and listing filled)."""
+        self.mark("listing")
+        with self._lock:
+            self.main_done = True
+            self.ready = self.last - self.start
+        self._maybe_report()
+
+    def _maybe_report(self) -> None:
+        with self._lock:
+            if self.reported or not self.main_done or self.pending:
+                return
+            self.reported = True
+            breakdown = ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.phases)
+        print(f"Startup: {breakdown}; ready after {self.ready * 1000:.0f} ms")
+
+
+@threaded
+def warm_up_tokenizer(timer: Optional[StartupTimer] = None) -> None:
+    """Load the tokenizer in the background so the first selection does not stall."""
+    started = timer.begin_background() if timer else 0.0
+    get_encoding()
+    if timer:
+        timer.end_background("tokenizer", started)
+
+
+class PathIndex:
+    """
+    Compact, array-backed model of the directory tree below a root folder.
+
+    Every file or folder is identified by an integer node id. Names are stored
+    as interned path segments and each node only keeps the index of its parent,
+    so listed entries do not keep any pathlib.Path objects alive. Full paths are
+    rebuilt on demand from the parent chain. Node 0 is always the root.
+
+    A folder listing is reused while the folder's mtime is unchanged; rescans keep
+    the ids of entries that still exist and drop the listings below removed ones.
+    Removed entries stay in the columns as orphans (ids are positions) until the
+    index is rebuilt. refresh() forces a folder and everything cached below it to
+    be re-scanned and re-sized.
+    """
+    __slots__ = ("root", "names", "parents", "sizes", "flags", "children", "mtimes", "orphans", "epoch", "_lock")
+
+    FLAG_DIR = 1
+    FLAG_LINK = 2
+    FLAG_ERROR = 4
+    UNKNOWN_SIZE = -1
+
+    def __init__(self, root: Path) -> None:
+        self.root: Path = root
+        self.names: List[str] = [sys.intern(root.name)]
+        self.parents: array = array("i", [-1])
+        self.sizes: array = array("q", [self.UNKNOWN_SIZE])
+        self.flags: bytearray = bytearray([self.FLAG_DIR])
+        # Child node ids of every folder that has been listed (folders first, then files)
+        self.children: Dict[int, array] = {}
+        # Folder mtime (ns) at the time each listing was scanned
+        self.mtimes: Dict[int, int] = {}
+        # Number of entries removed from the tree since the index was built
+        self.orphans: int = 0
+        # Incremented by refresh(); size walks started before a refresh discard their results
+        self.epoch: int = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _add(self, parent: int, name: str, flags: int, size: int) -> int:
+        """Append a node to the columns and return its id."""
+        self.names.append(sys.intern(name))
+        self.parents.append(parent)
+        self.sizes.append(size)
+        self.flags.append(flags)
+        return len(self.names) - 1
+
+    def is_dir(self, node: int) -> bool:
+        return bool(self.flags[node] & self.FLAG_DIR)
+
+    def has_error(self, node: int) -> bool:
+        return bool(self.flags[node] & self.FLAG_ERROR)
+
+    def suffix(self, node: int) -> str:
+        """Return the lowercase extension of a node without the leading dot."""
+        return os.path.splitext(self.names[node])[1][1:].lower()
+
+    def rel_parts(self, node: int) -> List[str]:
+        """Return the path segments of a node relative to the root."""
+        parts: List[str] = []
+        while node > 0:
+            parts.append(self.names[node])
+            node = self.parents[node]
+        parts.reverse()
+        return parts
+
+    def rel_posix(self, node: int) -> str:
+        """Return the root-relative POSIX path of a node ("." for the root)."""
+        return "/".join(self.rel_parts(node)) or "."
+
+    def path(self, node: int) -> Path:
+        """Rebuild the absolute path of a node."""
+        return self.root.joinpath(*self.rel_parts(node))
+
+    def _mtime(self, node: int) -> int:
+        try:
+            return os.stat(self.path(node)).st_mtime_ns
+        except OSError:
+            return -1
+
+    def _reset_sizes_up(self, node: int) -> None:
+        """Mark the size of a folder and all of its parent folders as unknown."""
+        while node >= 0:
+            self.sizes[node] = self.UNKNOWN_SIZE
+            node = self.parents[node]
+
+    def _drop(self, nodes: List[int]) -> None:
+        """Forget the listings of removed entries and everything cached below them."""
+        stack = list(nodes)
+        while stack:
+            current = stack.pop()
+            self.orphans += 1
+            self.mtimes.pop(current, None)
+            stack.extend(self.children.pop(current, ()))
+
+    def list_dir(self, node: int) -> array:
+        """
+        Return the child ids of a folder, scanning it if it was not listed yet or
+        its mtime changed since the last scan (entries added, removed or renamed).
+        Folders come first, then files, each sorted case-insensitively.
+        Entries that are neither files nor folders (e.g. broken links) are skipped.
+        """
+        mtime = self._mtime(node)
+        children = self.children.get(node)
+        if children is not None and self.mtimes.get(node) == mtime:
+            return children
+        with self._lock:
+            children = self.children.get(node)
+            if children is not None and self.mtimes.get(node) == mtime:
+                return children
+            folders: List[Tuple[str, int, int]] = []
+            files: List[Tuple[str, int, int]] = []
+            with os.scandir(self.path(node)) as entries:
+                for entry in entries:
+                    try:
+                        is_link = entry.is_symlink()
+                        if entry.is_dir():
+                            flags = self.FLAG_DIR | (self.FLAG_LINK if is_link else 0)
+                            folders.append((entry.name, flags, self.UNKNOWN_SIZE))
+                            continue
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    try:
+                        files.append((entry.name, 0, entry.stat().st_size))
+                    except OSError:
+                        files.append((entry.name, self.FLAG_ERROR, 0))
+            folders.sort(key=lambda e: e[0].lower())
+            files.sort(key=lambda e: e[0].lower())
+            
+            # Keep the ids of entries that survived a rescan so caches keyed by node id stay valid
+            previous: Dict[str, int] = {self.names[child]: child for child in children or ()}
+            ids = array("i")
+            for name, flags, size in folders + files:
+                child = previous.get(name, -1)
+                if child >= 0 and (self.flags[child] & self.FLAG_DIR) == (flags & self.FLAG_DIR):
+                    self.flags[child] = flags
+                    if not flags & self.FLAG_DIR:
+                        self.sizes[child] = size
+                else:
+                    child = self._add(node, name, flags, size)
+                ids.append(child)
+            if children is not None:
+                kept = set(ids)
+                self._drop([child for child in children if child not in kept])
+                self._reset_sizes_up(node)
+            self.children[node] = ids
+            self.mtimes[node] = mtime
+            return ids
+
+    def refresh(self, node: int) -> None:
+        """
+        Force a folder and every folder cached below it to be re-scanned (re-statting
+        file sizes) on next access, and forget the folder sizes along the way.
+        """
+        with self._lock:
+            self.epoch += 1
+            stack = [node]
+            while stack:
+                current = stack.pop()
+                self.mtimes.pop(current, None)
+                self.sizes[current] = self.UNKNOWN_SIZE
+                stack.extend(child for child in self.children.get(current, ()) if self.is_dir(child))
+            self._reset_sizes_up(node)
+
+    def find(self, parts: List[str]) -> Optional[int]:
+        """Return the node id of a root-relative path given as segments, or None if it does not exist."""
+        node = 0
+        for part in parts:
+            try:
+                children = self.list_dir(node)
+            except OSError:
+                return None
+            for child in children:
+                if self.names[child] == part:
+                    node = child
+                    break
+            else:
+                return None
+        return node
+
+    def dir_size(self, node: int, checkpoint: Optional[Callable[[], bool]] = None) -> Optional[int]:
+        """
+        Return the total size of all files below a folder and store it in the
+        size column. Every folder below is revisited through list_dir, so folders
+        whose mtime changed (entries added, removed or renamed) are rescanned; the
+        cost is one stat per folder plus a scan of the changed ones. File size
+        changes inside unchanged folders are picked up by refresh().
+        Symlinked folders are not descended into to avoid cycles. The walk is
+        iterative so very deep trees cannot hit the recursion limit.
+        
+        The walk may run on a background thread: sizes are summed and written
+        under the index lock, and None is returned instead of a size if the walk
+        became out of date (refresh() ran meanwhile) or checkpoint() returned False.
+        """
+        epoch = self.epoch
+        # Post-order walk: a folder is summed after all of its subfolders
+        stack: List[Tuple[int, bool]] = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                with self._lock:
+                    if self.epoch != epoch:
+                        return None
+                    total = 0
+                    for child in self.children.get(current, ()):
+                        if not self.is_dir(child):
+                            total += self.sizes[child]
+                        elif not self.flags[child] & self.FLAG_LINK:
+                            if self.sizes[child] == self.UNKNOWN_SIZE:
+                                # Reset by a concurrent rescan; leave this folder unknown too
+                                break
+                            total += self.sizes[child]
+                    else:
+                        self.sizes[current] = total
+                continue
+            if checkpoint is not None and not checkpoint():
+                return None
+            stack.append((current, True))
+            try:
+                children = self.list_dir(current)
+            except OSError:
+                continue
+            for child in children:
+                if self.is_dir(child) and not self.flags[child] & self.FLAG_LINK:
+                    stack.append((child, False))
+        size = self.sizes[node]
+        return None if size == self.UNKNOWN_SIZE else size
+
+    def search(self, node: int, term: str) -> List[int]:
+        """Return the children of a folder whose name contains the (lowercase) search term."""
+        children = self.list_dir(node)
+        if not term:
+            return list(children)
+        return [child for child in children if term in self.names[child].lower()]
+
+
+# Outline (skeleton) rendering: reduce a source file to its signatures only.
+def _docstring_summary(node: ast.AST) -> List[ast.stmt]:
+    """Return the first line of a node's docstring as a statement list (empty if none)."""
+    docstring = ast.get_docstring(node)
+    if not docstring or not docstring.strip():
+        return []
+    return [ast.Expr(ast.Constant(docstring.strip().splitlines()[0]))]
+
+
+def _outline_python_body(body: List[ast.stmt]) -> List[ast.stmt]:
+    """Keep classes, functions and assignments of a statement list, stubbing out bodies."""
+    outline: List[ast.stmt] = []
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            node.body = _docstring_summary(node) + [ast.Expr(ast.Constant(...))]
+            outline.append(node)
+        elif isinstance(node, ast.ClassDef):
+            members = _outline_python_body(node.body)
+            node.body = _docstring_summary(node) + (members or [ast.Expr(ast.Constant(...))])
+            outline.append(node)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            if node.value is not None:
+                node.value = ast.Constant(...)
+            outline.append(node)
+        elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith)) or \
+                (sys.version_info >= (3, 11) and isinstance(node, ast.TryStar)):
+            # Definitions guarded by if/try/with blocks (e.g. "try: import x / except ImportError:")
+            # are kept together with the guard; blocks without definitions are dropped
+            handlers = getattr(node, "handlers", [])
+            body = _outline_python_body(node.body)
+            handler_bodies = [_outline_python_body(handler.body) for handler in handlers]
+            orelse = _outline_python_body(getattr(node, "orelse", []))
+            finalbody = _outline_python_body(getattr(node, "finalbody", []))
+            if not (body or orelse or finalbody or any(handler_bodies)):
+                continue
+            node.body = body or [ast.Expr(ast.Constant(...))]
+            for handler, handler_body in zip(handlers, handler_bodies):
+                handler.body = handler_body or [ast.Expr(ast.Constant(...))]
+            if hasattr(node, "orelse"):
+                node.orelse = orelse
+            if hasattr(node, "finalbody"):
+                # A try statement needs at least one handler or a finally block
+                node.finalbody = finalbody or ([] if handlers else [ast.Expr(ast.Constant(...))])
+            outline.append(node)
+    return outline
+
+
+def outline_python(source: str) -> Optional[str]:
+    """Return the class/function signatures of Python source, or None if it cannot be parsed."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    tree.body = _outline_python_body(tree.body)
+    return ast.unparse(tree)
+
+
+_TS_DECL_RE = re.compile(
+    r"^(?:export\s+)?(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?"
+    r"(function|class|interface|type|enum|const|let|var|namespace|module)\b"
+)
+
+
+# A newline does not end a statement if the next line continues it
+_TS_CONTINUATION_RE = re.compile(r"\s*(?:extends\b|implements\b|=|\||&|\.)")
+# Characters after which a "/" starts a regex literal rather than a division
+_TS_REGEX_PRECEDERS = "(,=:[!&|?{};+-*%~^"
+
+
+def _ts_skip(src: str, i: int) -> int:
+    """
+    If a string, template literal, regex literal or comment starts at i, return
+    the index just after it; otherwise return i. Single-quoted and double-quoted
+    strings end at a newline, and a quote directly after a word character (an
+    apostrophe in JSX text like "Don't") does not start a string.
+    """
+    c = src[i]
+    n = len(src)
+    if c in "'\"":
+        if i > 0 and (src[i - 1].isalnum() or src[i - 1] == "_"):
+            return i
+        i += 1
+        while i < n and src[i] != c and src[i] != "\n":
+            i += 2 if src[i] == "\\" else 1
+        return min(i + 1, n)
+    if c == "`":
+        i += 1
+        depth = 0
+        while i < n:
+            ch = src[i]
+            if ch == "\\":
+                i += 2
+                continue
+            if depth == 0 and ch == "`":
+                return i + 1
+            if src.startswith("${", i):
+                depth += 1
+                i += 2
+                continue
+            if depth and ch == "}":
+                depth -= 1
+            i += 1
+        return n
+    if src.startswith("//", i):
+        end = src.find("\n", i)
+        return n if end < 0 else end
+    if src.startswith("/*", i):
+        end = src.find("*/", i + 2)
+        return n if end < 0 else end + 2
+    if c == "/":
+        # A regex literal can only follow an operator or an opening punctuator
+        k = i - 1
+        while k >= 0 and src[k] in " \t\r\n":
+            k -= 1
+        if k >= 0 and src[k] not in _TS_REGEX_PRECEDERS:
+            return i
+        j = i + 1
+        in_class = False
+        while j < n:
+            ch = src[j]
+            if ch == "\\":
+                j += 2
+                continue
+            if ch == "\n":
+                return i
+            if in_class:
+                in_class = ch != "]"
+            elif ch == "[":
+                in_class = True
+            elif ch == "/":
+                j += 1
+                while j < n and src[j].isalpha():
+                    j += 1
+                return j
+            j += 1
+    return i
+
+
+def _ts_match_brace(src: str, i: int) -> int:
+    """
+    Return the index just after the brace matching the "{" at i.
+    Raises ValueError if the braces do not balance.
+    """
+    depth = 0
+    n = len(src)
+    while i < n:
+        j = _ts_skip(src, i)
+        if j != i:
+            i = j
+            continue
+        c = src[i]
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError("unbalanced braces")
+
+
+def _ts_statement_open(statement: str, src: str, i: int) -> bool:
+    """Check whether the statement in progress continues after the newline at i."""
+    # An unclosed generic, e.g. "Promise<" followed by the type argument on the next line.
+    # Only a "<" directly after an identifier or "." opens a generic; "a < b" is a comparison.
+    depth = 0
+    for k in range(1, len(statement)):
+        ch = statement[k]
+        if ch == "<":
+            prev = statement[k - 1]
+            if prev.isalnum() or prev in "_$.":
+                depth += 1
+        elif ch == ">" and depth and statement[k - 1] != "=":
+            depth -= 1
+    if depth:
+        return True
+    if statement.rstrip().endswith(("=", "|", "&", ",", "extends", "implements")):
+        return True
+    return bool(_TS_CONTINUATION_RE.match(src, i + 1))
+
+
+def _ts_statements(src: str) -> List[str]:
+    """
+    Split TS/TSX source into the statements of its outermost level, skipping
+    comments. Function and object bodies are collapsed to "{ ... }", class bodies
+    are outlined recursively, and interface/type/enum bodies and export clauses
+    are kept verbatim. Raises ValueError if the braces do not balance.
+    """
+    statements: List[str] = []
+    buf: List[str] = []
+    parens = 0
+    i = 0
+    n = len(src)
+
+    def flush() -> None:
+        statement = "".join(buf).strip()
+        if statement:
+            statements.append(statement)
+        buf.clear()
+
+    while i < n:
+        j = _ts_skip(src, i)
+        if j != i:
+            if not src.startswith(("//", "/*"), i):
+                buf.append(src[i:j])
+            i = j
+            continue
+        c = src[i]
+        if c in "([":
+            parens += 1
+        elif c in ")]":
+            parens = max(0, parens - 1)
+        elif c == "{":
+            end = _ts_match_brace(src, i)
+            header = "".join(buf).strip()
+            match = _TS_DECL_RE.match(header) if parens == 0 else None
+            kind = match.group(1) if match else ""
+            if kind == "class":
+                members = _ts_statements(src[i + 1:end - 1])
+                body = "".join(f"\n  {member}" for member in members)
+                buf.append(f"{{{body}\n}}")
+            elif kind in ("interface", "type", "enum") or re.fullmatch(r"export(?:\s+type)?", header):
+                buf.append(src[i:end])
+            else:
+                buf.append("{ ... }")
+            i = end
+            continue
+        elif c == "}":
+            raise ValueError("unbalanced braces")
+        elif c in ";\n" and parens == 0:
+            if c == "\n" and _ts_statement_open("".join(buf), src, i):
+                # Join the continuation line with a single space
+                i += 1
+                while i < n and src[i] in " \t\r\n":
+                    i += 1
+                buf.append(" ")
+                continue
+            flush()
+            i += 1
+            continue
+        elif c == "\n":
+            # Multi-line parameter lists are joined into one line
+            i += 1
+            while i < n and src[i] in " \t\r":
+                i += 1
+            buf.append(" ")
+            continue
+        elif c in "\r\t":
+            c = " "
+        buf.append(c)
+        i += 1
+    flush()
+    return statements
+
+
+def outline_typescript(source: str) -> Optional[str]:
+    """
+    Return the top-level declarations (functions, classes, types, exports) of
+    JS/TS/TSX source using a lightweight lexer. Imports and statements are dropped,
+    and initializers that are not functions are replaced with "...". Returns None
+    if the source cannot be split reliably (unbalanced braces).
+
+    >>> outline_typescript("export { Button, buttonVariants }")
+    'export { Button, buttonVariants }'
+    >>> print(outline_typescript(
+    ...     "export interface ButtonProps\\n  extends React.HTMLAttributes<HTMLButtonElement>,\\n"
+    ...     "    VariantProps<typeof buttonVariants> {\\n  asChild?: boolean\\n}"))
+    export interface ButtonProps extends React.HTMLAttributes<HTMLButtonElement>, VariantProps<typeof buttonVariants> {
+      asChild?: boolean
+    }
+    >>> print(outline_typescript("export const re = /[{]/;\\nexport function after() { return 1 }"))
+    export const re = ...
+    export function after() { ... }
+    >>> outline_typescript("export function A() {\\n  return <p>Don't {\\n x}</p>\\n}")
+    'export function A() { ... }'
+    >>> outline_typescript("export function A() {\\n  return <p>{</p>\\n}") is None
+    True
+    >>> print(outline_typescript("const isSmall = width < 600\\nexport function Foo() { return 1 }\\nexport const Bar = 1\\n"))
+    const isSmall = ...
+    export function Foo() { ... }
+    export const Bar = ...
+    """
+    try:
+        statements = _ts_statements(source)
+    except ValueError:
+        return None
+    outline: List[str] = []
+    for statement in statements:
+        match = _TS_DECL_RE.match(statement)
+        if not match and not statement.startswith("export"):
+            continue
+        if match and match.group(1) in ("const", "let", "var") and "=>" not in statement:
+            statement = statement.split("=", 1)[0].rstrip() + (" = ..." if "=" in statement else "")
+        outline.append(statement)
+    return "\n".join(outline)
+
+
+# Rendering modes, in the order shown in the mode selector
+RENDER_MODES: Tuple[str, ...] = ("full", "outline", "auto")
+
+# File extensions (without the dot) that support outline rendering
+OUTLINERS: Dict[str, Any] = {
+    "py": outline_python,
+    "ts": outline_typescript,
+    "tsx": outline_typescript,
+    "js": outline_typescript,
+    "jsx": outline_typescript,
+    "mjs": outline_typescript,
+}
+
+
 class FileExplorer:
-    def __init__(self, master: tk.Tk) -> None:
+    def __init__(self, master: tk.Tk, startup_timer: Optional[StartupTimer] = None) -> None:
         """Initialize the File & Folder Viewer with LLM context token counter."""
         self.master: tk.Tk = master
+        self.startup_timer: Optional[StartupTimer] = startup_timer
         self.master.title("File & Folder Viewer - LLM Context Token Counter")
         self.master.geometry("1000x700")
         
         # Base directory: using pathlib to get the directory where this file is located.
         self.base_path: Path = Path(__file__).resolve().parent
-        self.current_path: Path = self.base_path
+        
+        # Compact tree model shared by the listing, size index, search and Markdown builder
+        self.index: PathIndex = PathIndex(self.base_path)
+        self.current_node: int = 0
         
         # Threading and task management
         self.task_queue = Queue()
         self.is_processing = False
         self.cancel_processing = False
         
-        # Cache for directory listings and file contents
-        self.dir_cache: Dict[Path, List[Path]] = {}
-        self.file_content_cache: Dict[Path, str] = {}
+        # Folder size walks run on their own worker so they never delay rendering;
+        # walks queued for an older listing (older generation) are skipped or aborted
+        self.size_queue: Queue = Queue()
+        self.size_generation: int = 0
+        
+        # Cache for file contents with the file's mtime, keyed by index node id
+        self.file_content_cache: Dict[int, Tuple[int, str]] = {}
         self.max_cache_size = 50  # Maximum number of files to cache
+        # Token counts are a few bytes each, and the breakdown needs one per rendered file,
+        # so their cache gets a larger limit than the file contents and outlines
+        self.max_token_cache_size = 5000
+        
+        # Outline (signatures only) rendering: cached outlines keyed by node id with the
+        # file's mtime, and the nodes (files or folders) explicitly switched to outline mode
+        self.outline_cache: Dict[int, Tuple[int, Optional[str]]] = {}
+        self.outline_nodes: Set[int] = set()
+        # Rendering mode and token budget the current text was rendered with
+        self.render_options: Tuple[str, int] = (RENDER_MODES[0], 100000)
+        
+        # Token breakdown of the current selection. section_tokens holds the tokens of each
+        # node's own Markdown section (a file's header and content, a folder's header);
+        # folder_tokens holds the sum of all sections below a folder, maintained from deltas.
+        # File section counts are cached by (node id, outlined, language) with the file's
+        # mtime so unchanged files are never re-encoded.
+        self.token_count_cache: Dict[Tuple[int, bool, str], Tuple[int, int]] = {}
+        self.section_tokens: Dict[int, int] = {}
+        self.folder_tokens: Dict[int, int] = {}
+        # Hash of the text widget content as rendered from the selection; while it is
+        # unchanged the footer shows the breakdown total instead of re-encoding the text
+        self.rendered_text_hash: Optional[int] = None
+        self.breakdown_sort: Tuple[str, bool] = ("tokens", True)
+        # Breakdown table rows by iid: [path, type, tokens, share text, heat tags], mirrored
+        # here so updates and sorting do not need to read values back from the widget
+        self.breakdown_rows: Dict[str, List[Any]] = {}
+        self.breakdown_total_shown: int = 0
         
         # Language translations
         self.translations: Dict[str, Dict[str, str]] = {
@@ -111,7 +773,15 @@ class FileExplorer:
                 "save_error": "File could not be saved: ",
                 "list_error": "Directory content could not be listed: ",
                 "processing": "Processing...",
-                "cancel": "Cancel"
+                "cancel": "Cancel",
+                "outline": "Outline",
+                "toggle_outline": "Toggle Outline",
+                "render_mode": "Mode: ",
+                "mode_full": "Full",
+                "mode_outline": "Outline",
+                "mode_auto": "Auto",
+                "token_budget": "Token Budget: ",
+                "token_breakdown": "Token Breakdown"
             },
             "TR": {
                 "title": "Dosya & Klasör Görüntüleyici - LLM Context Token Sayacı",
@@ -132,7 +802,15 @@ class FileExplorer:
                 "save_error": "Dosya kaydedilemedi: ",
                 "list_error": "Dizin içeriği listelenemedi: ",
                 "processing": "İşleniyor...",
-                "cancel": "İptal"
+                "cancel": "İptal",
+                "outline": "Taslak",
+                "toggle_outline": "Taslağı Aç/Kapat",
+                "render_mode": "Mod: ",
+                "mode_full": "Tam",
+                "mode_outline": "Taslak",
+                "mode_auto": "Otomatik",
+                "token_budget": "Token Bütçesi: ",
+                "token_breakdown": "Token Dağılımı"
             },
             "RU": {
                 "title": "Просмотрщик файлов и папок - Счетчик токенов LLM Context",
@@ -153,12 +831,21 @@ class FileExplorer:
                 "save_error": "Не удалось сохранить файл: ",
                 "list_error": "Не удалось получить содержимое каталога: ",
                 "processing": "Обработка...",
-                "cancel": "Отмена"
+                "cancel": "Отмена",
+                "outline": "Структура",
+                "toggle_outline": "Структура вкл/выкл",
+                "render_mode": "Режим: ",
+                "mode_full": "Полный",
+                "mode_outline": "Структура",
+                "mode_auto": "Авто",
+                "token_budget": "Бюджет токенов: ",
+                "token_breakdown": "Распределение токенов"
             }
         }
         
         self.setup_ui()
-        self.populate_listbox()
+        # Fill the listing once the window has been drawn, so it shows up immediately
+        self.master.after_idle(self.finish_startup)
         
         # Listen for language changes
         self.language_var.trace_add("write", self.on_language_change)
@@ -166,6 +853,8 @@ class FileExplorer:
         # Start the task processing thread
         self.process_tasks_thread = threading.Thread(target=self.process_tasks, daemon=True)
         self.process_tasks_thread.start()
+        self.process_size_tasks_thread = threading.Thread(target=self.process_size_tasks, daemon=True)
+        self.process_size_tasks_thread.start()
     
     def setup_ui(self) -> None:
         """Setup the user interface."""
@@ -218,13 +907,15 @@ class FileExplorer:
         self.list_frame.pack(fill=tk.BOTH, expand=True)
         
         # Use Treeview instead of Listbox for better visualization
-        self.tree = ttk.Treeview(self.list_frame, columns=("type", "size"), show="tree headings", selectmode="extended")
+        self.tree = ttk.Treeview(self.list_frame, columns=("type", "size", "tokens"), show="tree headings", selectmode="extended")
         self.tree.heading("#0", text="Name")
         self.tree.heading("type", text="Type")
         self.tree.heading("size", text="Size")
+        self.tree.heading("tokens", text="Tokens")
         self.tree.column("#0", width=200, stretch=True)
         self.tree.column("type", width=80, stretch=False)
         self.tree.column("size", width=80, anchor="e", stretch=False)
+        self.tree.column("tokens", width=70, anchor="e", stretch=False)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
@@ -235,6 +926,8 @@ class FileExplorer:
         # Bind selection and double-click events to the tree
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
         self.tree.bind("<Double-1>", self.on_item_double_click)
+        # F5 re-scans the current folder so new, deleted or resized files show up
+        self.master.bind("<F5>", self.refresh_listing)
         
         # Additional selection control buttons
         self.left_button_frame: ttk.Frame = ttk.Frame(self.left_frame, style="TFrame")
@@ -250,6 +943,14 @@ class FileExplorer:
         )
         self.clear_selection_button.pack(side=tk.LEFT)
         
+        self.toggle_outline_button: ttk.Button = ttk.Button(
+            self.left_button_frame, text=self.translations["EN"]["toggle_outline"], command=self.toggle_outline
+        )
+        self.toggle_outline_button.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # Items rendered as outlines are shown in a different color
+        self.tree.tag_configure("outline", foreground="#806000")
+        
         # RIGHT PANEL: Displays the source code in Markdown format and the LLM context token count
         self.right_frame: ttk.Frame = ttk.Frame(self.paned, padding=10, style="TFrame")
         self.paned.add(self.right_frame, weight=3)
@@ -293,6 +994,33 @@ class FileExplorer:
         
         top_right_frame.columnconfigure(1, weight=1)
         
+        # Rendering options: full contents, outlines only, or outlines when the token budget is exceeded
+        options_frame: ttk.Frame = ttk.Frame(self.right_frame, style="TFrame")
+        options_frame.pack(fill=tk.X, pady=(5, 5))
+        
+        self.render_mode_label: ttk.Label = ttk.Label(
+            options_frame, text=self.translations["EN"]["render_mode"], style="TLabel"
+        )
+        self.render_mode_label.pack(side=tk.LEFT)
+        
+        self.render_mode_combobox: ttk.Combobox = ttk.Combobox(
+            options_frame, values=self.get_render_mode_names("EN"), state="readonly", width=10
+        )
+        self.render_mode_combobox.current(0)
+        self.render_mode_combobox.pack(side=tk.LEFT, padx=(0, 10))
+        self.render_mode_combobox.bind("<<ComboboxSelected>>", self.on_render_options_change)
+        
+        self.token_budget_label: ttk.Label = ttk.Label(
+            options_frame, text=self.translations["EN"]["token_budget"], style="TLabel"
+        )
+        self.token_budget_label.pack(side=tk.LEFT)
+        
+        self.token_budget_var: tk.StringVar = tk.StringVar(value="100000")
+        token_budget_entry: ttk.Entry = ttk.Entry(options_frame, textvariable=self.token_budget_var, width=10)
+        token_budget_entry.pack(side=tk.LEFT)
+        token_budget_entry.bind("<Return>", self.on_render_options_change)
+        token_budget_entry.bind("<FocusOut>", self.on_render_options_change)
+        
         # Text widget with syntax highlighting for Markdown source code
         self.text_frame = ttk.Frame(self.right_frame, style="TFrame")
         self.text_frame.pack(fill=tk.BOTH, expand=True)
@@ -338,9 +1066,47 @@ class FileExplorer:
         )
         self.token_count_label.pack(side=tk.RIGHT, padx=5, pady=5)
         
+        # Per-file and per-folder token breakdown of the current selection (sortable by clicking headers)
+        self.breakdown_frame: ttk.Frame = ttk.Frame(self.right_frame, style="TFrame")
+        self.breakdown_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+        
+        self.breakdown_label: ttk.Label = ttk.Label(
+            self.breakdown_frame, text=self.translations["EN"]["token_breakdown"], style="Header.TLabel"
+        )
+        self.breakdown_label.pack(anchor="w")
+        
+        self.breakdown_table = ttk.Treeview(
+            self.breakdown_frame, columns=("type", "tokens", "share"), show="tree headings", height=8
+        )
+        for column, heading in (("#0", "Path"), ("type", "Type"), ("tokens", "Tokens"), ("share", "Share")):
+            self.breakdown_table.heading(column, text=heading, command=lambda c=column: self.sort_breakdown(c))
+        self.breakdown_table.column("#0", width=300, stretch=True)
+        self.breakdown_table.column("type", width=70, stretch=False)
+        self.breakdown_table.column("tokens", width=80, anchor="e", stretch=False)
+        self.breakdown_table.column("share", width=70, anchor="e", stretch=False)
+        self.breakdown_table.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        breakdown_scrollbar: ttk.Scrollbar = ttk.Scrollbar(
+            self.breakdown_frame, orient=tk.VERTICAL, command=self.breakdown_table.yview
+        )
+        breakdown_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.breakdown_table.config(yscrollcommand=breakdown_scrollbar.set)
+        
+        # Heatmap colors by share of the total token count
+        self.breakdown_table.tag_configure("heat_high", background="#f4c7c3")
+        self.breakdown_table.tag_configure("heat_mid", background="#fce8b2")
+        self.breakdown_table.tag_configure("heat_low", background="#fff8e1")
+        
         # Bind the <<Modified>> virtual event to update token count when the text content changes
         self.text.bind("<<Modified>>", self.on_text_modified)
     
+    def finish_startup(self) -> None:
+        """Populate the directory listing after the window is shown and report startup timing."""
+        self.master.update_idletasks()
+        self.populate_listbox()
+        if self.startup_timer:
+            self.startup_timer.done()
+    
     def on_language_change(self, *args: Any) -> None:
         """Update the UI elements when the language selection changes."""
         lang: str = self.language_var.get()
@@ -349,12 +1115,20 @@ class FileExplorer:
         self.up_button.config(text=self.translations[lang]["up_directory"])
         self.select_all_button.config(text=self.translations[lang]["select_all"])
         self.clear_selection_button.config(text=self.translations[lang]["clear_selection"])
+        self.toggle_outline_button.config(text=self.translations[lang]["toggle_outline"])
+        self.render_mode_label.config(text=self.translations[lang]["render_mode"])
+        mode_index = self.render_mode_combobox.current()
+        self.render_mode_combobox.config(values=self.get_render_mode_names(lang))
+        self.render_mode_combobox.current(mode_index)
+        self.token_budget_label.config(text=self.translations[lang]["token_budget"])
+        self.breakdown_label.config(text=self.translations[lang]["token_breakdown"])
         self.right_label.config(text=self.translations[lang]["source_code"])
         self.save_button.config(text=self.translations[lang]["save"])
         self.cancel_button.config(text=self.translations[lang]["cancel"])
         self.token_count_label.config(
-            text=self.translations[lang]["total_tokens"] + str(count_tokens(self.text.get("1.0", tk.END)))
+            text=self.translations[lang]["total_tokens"]
         )
+        self.update_token_count()
         self.populate_listbox()  # Update the current directory label
     
     def on_search_change(self, *args: Any) -> None:
@@ -369,6 +1143,70 @@ class FileExplorer:
             size_bytes /= 1024.0
         return f"{size_bytes:.1f} GB"
     
+    def get_token_str(self, node: int) -> str:
+        """Return the token count of a file/folder in the current selection ("" if not selected)."""
+        tokens = self.get_node_tokens(node)
+        return str(tokens) if tokens else ""
+    
+    def get_node_tokens(self, node: int) -> int:
+        """Return the tokens of a node's own section plus, for folders, all sections below it."""
+        return self.section_tokens.get(node, 0) + self.folder_tokens.get(node, 0)
+    
+    def get_breakdown_total(self) -> int:
+        """Return the total tokens of the rendered selection, from the incremental breakdown."""
+        return self.get_node_tokens(0)
+    
+    def refresh_listing(self, event: Any = None) -> None:
+        """
+        Re-scan the current folder and recompute the folder sizes below it (F5).
+        If entries were removed since the index was built, the index is rebuilt
+        first so their orphaned slots are released.
+        """
+        if self.index.orphans:
+            self.rebuild_index()
+        else:
+            self.index.refresh(self.current_node)
+        self.populate_listbox()
+    
+    def rebuild_index(self) -> None:
+        """
+        Replace the index with a fresh one. Node ids change, so the current folder,
+        outline selections and node-keyed caches are carried over by path, and any
+        pending work that still refers to the old ids is dropped.
+        """
+        self.cancel_processing = True
+        while not self.task_queue.empty():
+            try:
+                self.task_queue.get_nowait()
+                self.task_queue.task_done()
+            except Exception:
+                break
+        self.apply_token_breakdown({})
+        self.size_generation += 1
+        
+        old = self.index
+        new = PathIndex(self.base_path)
+        
+        def remap(node: int) -> Optional[int]:
+            return new.find(old.rel_parts(node))
+        
+        self.current_node = remap(self.current_node) or 0
+        self.outline_nodes = {n for n in map(remap, self.outline_nodes) if n is not None}
+        for cache in (self.file_content_cache, self.outline_cache):
+            entries = list(cache.items())
+            cache.clear()
+            for node, value in entries:
+                new_node = remap(node)
+                if new_node is not None:
+                    cache[new_node] = value
+        entries = list(self.token_count_cache.items())
+        self.token_count_cache.clear()
+        for (node, outlined, lang), value in entries:
+            new_node = remap(node)
+            if new_node is not None:
+                self.token_count_cache[(new_node, outlined, lang)] = value
+        self.index = new
+    
     def populate_listbox(self) -> None:
         """
         List files and folders in the current directory in alphabetical order.
@@ -379,52 +1217,40 @@ class FileExplorer:
             for item in self.tree.get_children():
                 self.tree.delete(item)
                 
-            # Get items from cache or directory
-            if self.current_path in self.dir_cache:
-                items = self.dir_cache[self.current_path]
-            else:
-                items = list(self.current_path.iterdir())
-                self.dir_cache[self.current_path] = items
-                
-            # Sort items (folders first, then files)
-            folders = sorted([p for p in items if p.is_dir()], key=lambda p: p.name.lower())
-            files = sorted([p for p in items if p.is_file()], key=lambda p: p.name.lower())
-            
-            # Filter by search term if provided
+            # Children come from the index already ordered (folders first, then files)
+            # and filtered by the search term if provided. Tree iids are node ids.
             search_term = self.search_var.get().lower()
-            if search_term:
-                folders = [f for f in folders if search_term in f.name.lower()]
-                files = [f for f in files if search_term in f.name.lower()]
-            
-            # Add folders to tree
-            for folder in folders:
-                folder_size = sum(f.stat().st_size for f in folder.glob('**/*') if f.is_file())
-                self.tree.insert("", "end", iid=str(folder), text=folder.name, 
-                                values=("Folder", self.get_file_size_str(folder_size)))
-                
-            # Add files to tree
-            for file in files:
-                try:
-                    size = file.stat().st_size
+            index = self.index
+            pending_sizes: List[int] = []
+            for node in index.search(self.current_node, search_term):
+                if index.is_dir(node):
+                    # Known folder sizes are shown right away; all folder sizes are
+                    # (re)validated in the background and filled in when done
+                    size = index.sizes[node]
+                    pending_sizes.append(node)
+                    size_str = "..." if size == index.UNKNOWN_SIZE else self.get_file_size_str(size)
+                    values = ("Folder", size_str, self.get_token_str(node))
+                elif index.has_error(node):
+                    values = ("Error", "Unknown", "")
+                else:
                     # Determine file type based on extension
-                    ext = file.suffix.lower()
-                    file_type = ext[1:].upper() if ext else "File"
-                    self.tree.insert("", "end", iid=str(file), text=file.name, 
-                                    values=(file_type, self.get_file_size_str(size)))
-                except Exception:
-                    self.tree.insert("", "end", iid=str(file), text=file.name, 
-                                    values=("Error", "Unknown"))
+                    ext = index.suffix(node)
+                    file_type = ext.upper() if ext else "File"
+                    values = (file_type, self.get_file_size_str(index.sizes[node]), self.get_token_str(node))
+                tags = ("outline",) if self.is_outlined(node) else ()
+                self.tree.insert("", "end", iid=str(node), text=index.names[node], values=values, tags=tags)
+            
+            self.size_generation += 1
+            for node in pending_sizes:
+                self.size_queue.put((self.size_generation, node))
             
             # Get the relative current path with respect to the base directory
-            try:
-                rel_current = str(self.current_path.relative_to(self.base_path))
-            except ValueError:
-                rel_current = str(self.current_path)
+            rel_current = index.rel_posix(self.current_node)
             if rel_current == ".":
                 rel_current = self.base_path.name
             lang: str = self.language_var.get()
             self.current_path_label.config(text=f"{self.translations[lang]['current_dir']}{rel_current}")
-            if self.current_path == self.base_path:
+            if self.current_node == 0:
                 self.up_button.state(["disabled"])
             else:
                 self.up_button.state(["!disabled"])
@@ -432,24 +1258,72 @@ class FileExplorer:
             lang = self.language_var.get()
             messagebox.showerror("Error", f"{self.translations[lang]['list_error']}{e}")
     
-    def read_file_content(self, path: Path) -> str:
-        """Read file content with caching for better performance"""
-        if path in self.file_content_cache:
-            return self.file_content_cache[path]
-        
+    def set_folder_size(self, generation: int, node: int, size: int) -> None:
+        """Fill in a folder size computed in the background, if the listing is still current."""
+        iid = str(node)
+        if generation == self.size_generation and self.tree.exists(iid):
+            self.tree.set(iid, "size", self.get_file_size_str(size))
+    
+    @staticmethod
+    def cache_put(cache: Dict[Any, Any], key: Any, value: Any, max_size: int) -> None:
+        """Store a value in a cache dict, removing the least recently added item when full."""
+        if key not in cache and len(cache) >= max_size:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+    
+    def read_file_content(self, node: int) -> Tuple[str, int]:
+        """
+        Read file content with caching for better performance. Returns the content
+        and the file's mtime taken when it was read (-1 if the file could not be read);
+        cached content is only reused while the mtime is unchanged.
+        """
+        path = self.index.path(node)
         try:
+            mtime = path.stat().st_mtime_ns
+            cached = self.file_content_cache.get(node)
+            if cached is not None and cached[0] == mtime:
+                return cached[1], mtime
             content = path.read_text(encoding="utf-8")
             
             # Cache the content (with size management)
-            if len(self.file_content_cache) >= self.max_cache_size:
-                # Remove the first item (least recently added)
-                self.file_content_cache.pop(next(iter(self.file_content_cache)))
-            self.file_content_cache[path] = content
+            self.cache_put(self.file_content_cache, node, (mtime, content), self.max_cache_size)
             
-            return content
+            return content, mtime
         except Exception as e:
             lang = self.language_var.get()
-            return f"{self.translations[lang]['file_read_error']}{e}"
+            return f"{self.translations[lang]['file_read_error']}{e}", -1
+    
+    def read_file_outline(self, node: int) -> Tuple[Optional[str], int]:
+        """
+        Return the outline (signatures only) of a source file, cached per file by mtime,
+        together with that mtime. The outline is None if the file type is not supported
+        or the file cannot be outlined.
+        """
+        outliner = OUTLINERS.get(self.index.suffix(node))
+        if outliner is None:
+            return None, -1
+        path = self.index.path(node)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None, -1
+        cached = self.outline_cache.get(node)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], mtime
+        try:
+            outline = outliner(path.read_text(encoding="utf-8"))
+        except Exception:
+            outline = None
+        self.cache_put(self.outline_cache, node, (mtime, outline), self.max_cache_size)
+        return outline, mtime
+    
+    def is_outlined(self, node: int) -> bool:
+        """Check whether a node or one of its parent folders was switched to outline mode."""
+        while node >= 0:
+            if node in self.outline_nodes:
+                return True
+            node = self.index.parents[node]
+        return False
     
     def process_tasks(self) -> None:
         """Process tasks from the queue in a background thread"""
@@ -466,8 +1340,9 @@ class FileExplorer:
                     
                     # Check if processing was cancelled
                     if not self.cancel_processing and callback:
-                        # Schedule callback to run in the main thread
-                        self.master.after(0, lambda: callback(result))
+                        # Schedule callback to run in the main thread (bind the current
+                        # callback/result, the loop may pick up the next task first)
+                        self.master.after(0, lambda cb=callback, r=result: cb(r))
                     
                     self.is_processing = False
                     self.task_queue.task_done()
@@ -481,6 +1356,31 @@ class FileExplorer:
             # Small delay to prevent CPU hogging
             time.sleep(0.01)
     
+    def process_size_tasks(self) -> None:
+        """Compute folder sizes in a background thread, yielding to any pending rendering work"""
+        while True:
+            generation, node = self.size_queue.get()
+            if generation != self.size_generation:
+                continue
+            try:
+                checkpoint = functools.partial(self.size_walk_checkpoint, generation)
+                size = self.index.dir_size(node, checkpoint)
+                if size is not None and generation == self.size_generation:
+                    self.master.after(0, functools.partial(self.set_folder_size, generation, node, size))
+            except Exception as e:
+                print(f"Error in folder size calculation: {e}")
+    
+    def size_walk_checkpoint(self, generation: int) -> bool:
+        """
+        Called between folders of a size walk: waits while selections are being
+        rendered, and returns False if the walk belongs to an outdated listing.
+        """
+        while self.is_processing or not self.task_queue.empty():
+            if generation != self.size_generation:
+                return False
+            time.sleep(0.05)
+        return generation == self.size_generation
+    
     def show_progress(self) -> None:
         """Show progress indicator for long operations"""
         lang = self.language_var.get()
@@ -497,90 +1397,259 @@ class FileExplorer:
         """Cancel the currently running task"""
         self.cancel_processing = True
     
-    def get_markdown_for_path(self, path: Path, max_depth: int = 3, current_depth: int = 0) -> str:
+    def count_file_tokens(self, node: int, outlined: bool, lang: str, mtime: int, markdown: str) -> int:
+        """
+        Return the token count of a file's Markdown section, cached per file by the
+        mtime the content was read at. The language is part of the key because the
+        section header is translated. Unreadable files (mtime -1) are not cached.
+        """
+        if mtime < 0:
+            return count_tokens(markdown)
+        key = (node, outlined, lang)
+        cached = self.token_count_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        tokens = count_tokens(markdown)
+        self.cache_put(self.token_count_cache, key, (mtime, tokens), self.max_token_cache_size)
+        return tokens
+    
+    def get_markdown_for_path(self, node: int, max_depth: int = 3, current_depth: int = 0,
+                              outline: bool = False, section_tokens: Optional[Dict[int, int]] = None) -> str:
         """
-        Generate Markdown content for the given file or folder path.
+        Generate Markdown content for the given file or folder node of the index.
         - File: Uses the relative path as a header and includes its content inside a code block.
+          In outline mode (or if the file/folder was toggled to outline) only signatures are included.
         - Folder: Uses the folder name as a header and recursively includes all files/folders inside.
         
         Implements depth limiting to prevent excessive recursion for large directories.
+        If section_tokens is given, the token count of each node's own section (file header
+        and content, folder header) is added to it.
         """
         # Check for cancellation request
         if self.cancel_processing:
             return "Operation cancelled"
             
-        try:
-            rel_path = path.relative_to(self.base_path)
-        except ValueError:
-            rel_path = path
-        display_path: str = f"{self.base_path.name}/{rel_path.as_posix()}"
+        index = self.index
+        display_path: str = f"{self.base_path.name}/{index.rel_posix(node)}"
         lang: str = self.language_var.get()
         
-        if path.is_file():
-            content = self.read_file_content(path)
+        if not index.is_dir(node):
+            content = None
+            if outline or self.is_outlined(node):
+                content, mtime = self.read_file_outline(node)
+            outlined = content is not None
+            if outlined:
+                display_path += f" ({self.translations[lang]['outline']})"
+            else:
+                content, mtime = self.read_file_content(node)
             # Get file extension
-            ext = path.suffix.lower()[1:] if path.suffix else "text"
+            ext = index.suffix(node) or "text"
             markdown_str: str = f"## {display_path}\n\n```{ext}\n{content}\n```\n\n"
+            if section_tokens is not None:
+                tokens = self.count_file_tokens(node, outlined, lang, mtime, markdown_str)
+                section_tokens[node] = section_tokens.get(node, 0) + tokens
             return markdown_str
-        elif path.is_dir():
+        else:
             markdown_str: str = f"## {display_path} ({self.translations[lang]['folder']})\n\n"
             
             # Stop recursion if we've reached the maximum depth
             if current_depth >= max_depth:
                 markdown_str += f"*Directory content not shown due to depth limit ({max_depth})*\n\n"
+                if section_tokens is not None:
+                    section_tokens[node] = section_tokens.get(node, 0) + count_tokens(markdown_str)
                 return markdown_str
-                
+            
+            header = markdown_str
             try:
-                # Get directory items from cache if available
-                if path in self.dir_cache:
-                    items = self.dir_cache[path]
-                else:
-                    items = list(path.iterdir())
-                    self.dir_cache[path] = items
-                
-                # Process folders first, then files
-                folders = sorted([p for p in items if p.is_dir()], key=lambda p: p.name.lower())
-                files = sorted([p for p in items if p.is_file()], key=lambda p: p.name.lower())
-                
-                # Process folders
-                for item in folders:
-                    markdown_str += self.get_markdown_for_path(item, max_depth, current_depth + 1)
-                
-                # Process files
-                for item in files:
-                    markdown_str += self.get_markdown_for_path(item, max_depth, current_depth + 1)
+                # The index lists folders first, then files
+                for child in index.list_dir(node):
+                    markdown_str += self.get_markdown_for_path(
+                        child, max_depth, current_depth + 1, outline, section_tokens
+                    )
                     
             except Exception as e:
-                markdown_str += f"{self.translations[lang]['folder_read_error']}{e}\n\n"
+                error = f"{self.translations[lang]['folder_read_error']}{e}\n\n"
+                markdown_str += error
+                header += error
+            if section_tokens is not None:
+                section_tokens[node] = section_tokens.get(node, 0) + count_tokens(header)
             return markdown_str
-        else:
-            return ""
     
     def process_selection(self, selections: List[str]) -> None:
         """Process the selected items and update the text widget with markdown content"""
         # Show progress indicator
         self.show_progress()
         
-        def generate_markdown(selections):
+        # Read the rendering options here, in the main thread
+        mode, budget = self.render_options = self.get_render_options()
+        
+        def build_markdown(selections, outline):
             full_markdown = ""
+            section_tokens: Dict[int, int] = {}
             for item_id in selections:
-                full_path = Path(item_id)
-                markdown = self.get_markdown_for_path(full_path)
+                markdown = self.get_markdown_for_path(int(item_id), outline=outline, section_tokens=section_tokens)
                 if self.cancel_processing:
-                    return "Operation cancelled."
+                    return "Operation cancelled.", {}
                 full_markdown += markdown
-            return full_markdown
+            return full_markdown, section_tokens
+        
+        def generate_markdown(selections):
+            full_markdown, section_tokens = build_markdown(selections, mode == "outline")
+            # In auto mode, fall back to outlines when the full contents exceed the token budget.
+            # The per-file counts are cached, so the whole text does not need to be re-encoded.
+            if mode == "auto" and budget > 0 and not self.cancel_processing \
+                    and sum(section_tokens.values()) > budget:
+                full_markdown, section_tokens = build_markdown(selections, True)
+            return full_markdown, section_tokens
         
-        def update_text(markdown):
+        def update_text(result):
+            markdown, section_tokens = result
+            self.apply_token_breakdown(section_tokens)
             self.text.delete("1.0", tk.END)
             if markdown:
                 self.text.insert(tk.END, markdown)
                 self.highlight_markdown()
+            self.rendered_text_hash = hash(self.text.get("1.0", tk.END))
             self.update_token_count()
         
         # Add the task to the queue
         self.task_queue.put((generate_markdown, (selections,), update_text))
     
+    def apply_token_breakdown(self, section_tokens: Dict[int, int]) -> None:
+        """
+        Replace the token breakdown with the per-section counts of a new selection.
+        Only sections whose count changed are applied, as deltas along their parent
+        folder chain, so the aggregation costs O(changed sections x depth).
+        """
+        deltas: Dict[int, int] = {}
+        for node, tokens in section_tokens.items():
+            delta = tokens - self.section_tokens.get(node, 0)
+            if delta:
+                deltas[node] = delta
+        for node, tokens in self.section_tokens.items():
+            if node not in section_tokens:
+                deltas[node] = -tokens
+        if not deltas:
+            return
+        
+        touched: Set[int] = set()
+        parents = self.index.parents
+        for node, delta in deltas.items():
+            if node in section_tokens:
+                self.section_tokens[node] = section_tokens[node]
+            else:
+                del self.section_tokens[node]
+            touched.add(node)
+            folder = parents[node]
+            while folder >= 0:
+                total = self.folder_tokens.get(folder, 0) + delta
+                if total:
+                    self.folder_tokens[folder] = total
+                else:
+                    self.folder_tokens.pop(folder, None)
+                touched.add(folder)
+                folder = parents[folder]
+        
+        # Update the token column of the visible tree items
+        for node in touched:
+            iid = str(node)
+            if self.tree.exists(iid):
+                self.tree.set(iid, "tokens", self.get_token_str(node))
+        self.refresh_breakdown_table(touched)
+    
+    @staticmethod
+    def get_heat_tags(share: float) -> Tuple[str, ...]:
+        """Return the heatmap tag of a breakdown row for its share of the total."""
+        if share >= 0.25:
+            return ("heat_high",)
+        if share >= 0.10:
+            return ("heat_mid",)
+        if share >= 0.03:
+            return ("heat_low",)
+        return ()
+    
+    def refresh_breakdown_table(self, touched: Set[int]) -> None:
+        """
+        Add, update or remove the breakdown rows of the touched nodes. Shares and heat
+        colors of the other rows are only recomputed when the total changed, and only
+        rows whose displayed share or color changes are updated. The table is re-sorted
+        when rows were added, or when token counts changed while sorting by tokens.
+        """
+        table = self.breakdown_table
+        rows = self.breakdown_rows
+        inserted = False
+        updated = False
+        for node in touched:
+            # The root folder total is the footer total
+            if node == 0:
+                continue
+            iid = str(node)
+            tokens = self.get_node_tokens(node)
+            row = rows.get(iid)
+            if not tokens:
+                if row is not None:
+                    table.delete(iid)
+                    del rows[iid]
+            elif row is not None:
+                row[2] = tokens
+                table.set(iid, "tokens", tokens)
+                updated = True
+            else:
+                kind = "Folder" if self.index.is_dir(node) else "File"
+                text = self.index.rel_posix(node)
+                rows[iid] = [text, kind, tokens, "", ()]
+                table.insert("", "end", iid=iid, text=text, values=(kind, tokens, ""))
+                inserted = True
+        
+        total = self.get_breakdown_total()
+        if total != self.breakdown_total_shown:
+            self.breakdown_total_shown = total
+            targets: Any = list(rows)
+        else:
+            targets = [str(node) for node in touched if str(node) in rows]
+        for iid in targets:
+            row = rows[iid]
+            share = row[2] / total if total else 0.0
+            share_text = f"{share:.1%}"
+            if share_text != row[3]:
+                row[3] = share_text
+                table.set(iid, "share", share_text)
+            tags = self.get_heat_tags(share)
+            if tags != row[4]:
+                row[4] = tags
+                table.item(iid, tags=tags)
+        
+        if inserted or (updated and self.breakdown_sort[0] in ("tokens", "share")):
+            self.sort_breakdown()
+    
+    def sort_breakdown(self, column: Optional[str] = None) -> None:
+        """
+        Sort the breakdown table. Clicking a column header sorts by that column;
+        clicking it again reverses the order. Without a column, the current order is reapplied.
+        """
+        sort_column, reverse = self.breakdown_sort
+        if column is not None:
+            reverse = not reverse if column == sort_column else column != "#0"
+            sort_column = column
+            self.breakdown_sort = (sort_column, reverse)
+        
+        rows = self.breakdown_rows
+        if sort_column == "#0":
+            key = lambda iid: rows[iid][0].lower()
+        elif sort_column == "type":
+            key = lambda iid: rows[iid][1]
+        else:
+            key = lambda iid: rows[iid][2]
+        table = self.breakdown_table
+        current = list(table.get_children())
+        ordered = sorted(current, key=key, reverse=reverse)
+        for position, (iid, previous) in enumerate(zip(ordered, current)):
+            if iid != previous:
+                table.move(iid, "", position)
+                # Mirror the move so later positions are compared against the real order
+                current.remove(iid)
+                current.insert(position, iid)
+    
     def highlight_markdown(self) -> None:
         """Apply syntax highlighting to the markdown text"""
         content = self.text.get("1.0", tk.END)
@@ -635,12 +1704,49 @@ class FileExplorer:
         """
         selections = self.tree.selection()
         if not selections:
+            self.apply_token_breakdown({})
             self.text.delete("1.0", tk.END)
             self.update_token_count()
             return
             
         self.process_selection(selections)
     
+    def get_render_mode_names(self, lang: str) -> List[str]:
+        """Return the translated names of the rendering modes for the mode selector."""
+        return [self.translations[lang][f"mode_{mode}"] for mode in RENDER_MODES]
+    
+    def get_render_options(self) -> Tuple[str, int]:
+        """Return the selected rendering mode and the parsed token budget (0 if invalid)."""
+        mode = RENDER_MODES[max(self.render_mode_combobox.current(), 0)]
+        try:
+            budget = int(self.token_budget_var.get())
+        except ValueError:
+            budget = 0
+        return mode, budget
+    
+    def on_render_options_change(self, *args: Any) -> None:
+        """Re-render the current selection when the rendering mode or token budget actually changed."""
+        options = self.get_render_options()
+        if options == self.render_options:
+            return
+        self.render_options = options
+        if self.tree.selection():
+            self.on_select(None)
+    
+    def toggle_outline(self) -> None:
+        """Switch the selected files/folders between full and outline rendering."""
+        selections = self.tree.selection()
+        if not selections:
+            return
+        for item_id in selections:
+            node = int(item_id)
+            if node in self.outline_nodes:
+                self.outline_nodes.discard(node)
+            else:
+                self.outline_nodes.add(node)
+            self.tree.item(item_id, tags=("outline",) if self.is_outlined(node) else ())
+        self.on_select(None)
+    
     def on_item_double_click(self, event: Any) -> None:
         """
         If a folder is double-clicked in the tree, navigate into that folder.
@@ -648,10 +1754,10 @@ class FileExplorer:
         selection = self.tree.selection()
         if not selection:
             return
-        item_id = selection[0]
-        full_path = Path(item_id)
-        if full_path.is_dir():
-            self.current_path = full_path
+        node = int(selection[0])
+        if self.index.is_dir(node):
+            self.current_node = node
+            self.apply_token_breakdown({})
             self.populate_listbox()
             self.text.delete("1.0", tk.END)
             self.update_token_count()
@@ -661,16 +1767,15 @@ class FileExplorer:
         Navigate to the parent directory (preventing navigation outside the base directory).
         """
         lang: str = self.language_var.get()
-        if self.current_path == self.base_path:
+        if self.current_node == 0:
             messagebox.showinfo("Info", self.translations[lang]["root_dir_info"])
             return
-        new_path: Path = self.current_path.parent
-        try:
-            new_path.relative_to(self.base_path)
-        except ValueError:
+        new_node: int = self.index.parents[self.current_node]
+        if new_node < 0:
             messagebox.showerror("Error", self.translations[lang]["root_dir_error"])
             return
-        self.current_path = new_path
+        self.current_node = new_node
+        self.apply_token_breakdown({})
         self.populate_listbox()
         self.text.delete("1.0", tk.END)
         self.update_token_count()
@@ -684,6 +1789,7 @@ class FileExplorer:
     def clear_selection(self) -> None:
         """Clear the selection in the tree and clear the Text widget."""
         self.tree.selection_remove(self.tree.selection())
+        self.apply_token_breakdown({})
         self.text.delete("1.0", tk.END)
         self.update_token_count()
     
@@ -699,7 +1805,11 @@ class FileExplorer:
             messagebox.showerror("Error", f"{self.translations[lang]['save_error']}{e}")
     
     def update_token_count(self) -> None:
-        """Calculate the token count of the text and update the token count label."""
+        """
+        Update the token count label. While the text is exactly as rendered from the
+        selection, the incrementally maintained breakdown total is shown; the text is
+        only re-encoded after the user edits it.
+        """
         content: str = self.text.get("1.0", tk.END)
         
         # Use a background thread for token counting of large texts
@@ -710,8 +1820,10 @@ class FileExplorer:
             lang: str = self.language_var.get()
             self.token_count_label.config(text=f"{self.translations[lang]['total_tokens']}{count}")
             
+        if self.rendered_text_hash is not None and hash(content) == self.rendered_text_hash:
+            update_label(self.get_breakdown_total())
         # For very small texts, count directly to avoid the overhead of creating a thread
-        if len(content) < 10000:
+        elif len(content) < 10000:
             update_label(count_tokens(content))
         else:
             self.task_queue.put((count_in_background, (content,), update_label))
@@ -728,6 +1840,10 @@ class FileExplorer:
 
 def main() -> None:
     """Main function to run the File Explorer application."""
+    timer = StartupTimer(_MODULE_START)
+    timer.mark("imports")
+    warm_up_tokenizer(timer)
+    
     root: tk.Tk = tk.Tk()
     # Set the overall window transparency to 97%
     root.attributes("-alpha", 0.97)
@@ -741,7 +1857,10 @@ def main() -> None:
     style.configure("Treeview", background="#ffffff", fieldbackground="#ffffff", foreground="#000000")
     style.map("Treeview", background=[("selected", "#4a6984")], foreground=[("selected", "#ffffff")])
     
-    app = FileExplorer(root)
+    timer.mark("window")
+    
+    app = FileExplorer(root, timer)
+    timer.mark("ui")
     root.mainloop()
 
 